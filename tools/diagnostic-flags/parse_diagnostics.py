@@ -10,117 +10,146 @@ Usage:
 """
 
 import argparse
+import functools
 import json
+import os
 import re
 import ssl
 import sys
-from urllib.request import urlopen
-from urllib.error import URLError
-from html.parser import HTMLParser
+import zlib
+from collections import defaultdict, deque
+from html import unescape
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    # No extra dependencies required; fall back to the stdlib parser
+    lxml_html = None
+
+try:
+    import orjson
+except ImportError:
+    # Optional as well; stdlib json is the fallback
+    orjson = None
+
+
+# Compiled once: these run on every heading/paragraph of the reference page
+_FLAG_RE = re.compile(r'^(-W[a-zA-Z0-9+\-_#=]+)')
+_CONTROLS_RE = re.compile(r'(?:Also )?[Cc]ontrols\s+(.+?)\.?$')
+_SYNONYM_RE = re.compile(r'Synonym for\s+\\?(-W[a-zA-Z0-9+\-_#=]+)')
+_FLAG_FINDALL_RE = re.compile(r'-W[a-zA-Z0-9+\-_#=]+')
+
+# One pass over the document: the only markup that matters is heading text
+# and paragraph text, in order
+_BLOCK_RE = re.compile(r'<(h[234])[^>]*>(.*?)</\1>|<p[^>]*>(.*?)</p>', re.S)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _new_flag_entry():
+    """Fresh entry for a flag that hasn't been seen yet."""
+    return {
+        'implies': set(),
+        'implied_by': set(),
+        'description': '',
+        'is_error': False,
+        'is_default': False,
+        'some_default': False,
+        'synonym_for': None,
+        'has_no_effect': False
+    }
+
+
+def _block_text(fragment):
+    """Recover plain text from a matched HTML fragment."""
+    return unescape(_TAG_RE.sub('', fragment))
 
 
-class DiagnosticsParser(HTMLParser):
+class DiagnosticsParser:
     """Parse the Clang diagnostics HTML to extract flag relationships."""
 
+    # Possible now that the class no longer subclasses HTMLParser: fixed
+    # attribute offsets instead of per-instance __dict__ lookups
+    __slots__ = ('flags', 'synonyms', 'current_flag')
+
     def __init__(self):
-        super().__init__()
-        self.flags = {}  # flag_name -> {implies: [], implied_by: [], description: str}
+        # flag_name -> {implies: set(), implied_by: set(), description: str, ...}
+        self.flags = defaultdict(_new_flag_entry)
         self.synonyms = {}  # synonym_name -> canonical_name
         self.current_flag = None
-        self.current_section = None
-        self.in_heading = False
-        self.in_paragraph = False
-        self.capture_text = False
-        self.text_buffer = ""
-        self.heading_level = None
-
-    def handle_starttag(self, tag, attrs):
-        attrs_dict = dict(attrs)
-
-        # Detect heading tags (h3 for flags)
-        if tag in ('h2', 'h3', 'h4'):
-            self.in_heading = True
-            self.heading_level = tag
-            self.text_buffer = ""
-
-        # Detect paragraph for "Also controls" text
-        if tag == 'p':
-            self.in_paragraph = True
-            self.text_buffer = ""
-
-    def handle_endtag(self, tag):
-        if tag in ('h2', 'h3', 'h4') and self.in_heading:
-            self.in_heading = False
-            heading_text = self.text_buffer.strip()
-
-            # Extract flag name from heading (format: "-Wflag-name¶")
-            # Include = for flags like -Wformat=2
-            match = re.match(r'^(-W[a-zA-Z0-9+\-_#=]+)', heading_text)
-            if match:
-                flag_name = match.group(1)
-                self.current_flag = flag_name
-                if flag_name not in self.flags:
-                    self.flags[flag_name] = {
-                        'implies': [],
-                        'implied_by': [],
-                        'description': '',
-                        'is_error': False,
-                        'is_default': False,
-                        'some_default': False,
-                        'synonym_for': None,
-                        'has_no_effect': False
-                    }
-
-        if tag == 'p' and self.in_paragraph:
-            self.in_paragraph = False
-            para_text = self.text_buffer.strip()
-
-            if self.current_flag and para_text:
-                # Check for "Controls" or "Also controls" pattern
-                # The HTML uses anchor tags for flags, so the text looks like:
-                # "Controls -Wflag1, -Wflag2, -Wflag3."
-                # or "Also controls -Wflag1, -Wflag2."
-                controls_match = re.search(
-                    r'(?:Also )?[Cc]ontrols\s+(.+?)\.?$',
-                    para_text
-                )
-                if controls_match:
-                    controlled_flags_str = controls_match.group(1)
-                    controlled_flags = re.findall(r'-W[a-zA-Z0-9+\-_#=]+', controlled_flags_str)
-                    for controlled in controlled_flags:
-                        if controlled not in self.flags[self.current_flag]['implies']:
-                            self.flags[self.current_flag]['implies'].append(controlled)
-
-                # Check for "Synonym for" pattern
-                synonym_match = re.search(r'Synonym for\s+\\?(-W[a-zA-Z0-9+\-_#=]+)', para_text)
-                if synonym_match:
-                    synonym_flag = synonym_match.group(1)
-                    # Store this flag as a synonym of the canonical flag
-                    self.synonyms[self.current_flag] = synonym_flag
-                    # Also add to implies for the graph representation
-                    if synonym_flag not in self.flags[self.current_flag]['implies']:
-                        self.flags[self.current_flag]['implies'].append(synonym_flag)
-
-                # Check if it's an error by default
-                if 'error by default' in para_text.lower():
-                    self.flags[self.current_flag]['is_error'] = True
-
-                # Check if enabled by default - must be the flag itself, not just sub-flags
-                # "This diagnostic is enabled by default" = the flag is on by default
-                # "Some of the diagnostics controlled by this flag are enabled by default" = only sub-flags
-                if 'This diagnostic is enabled by default' in para_text:
-                    self.flags[self.current_flag]['is_default'] = True
-                elif 'Some of the diagnostics controlled by this flag are enabled by default' in para_text:
-                    self.flags[self.current_flag]['is_default'] = False
-                    self.flags[self.current_flag]['some_default'] = True
-                
-                # Check if the flag has no effect (should be treated as enabled for consistency)
-                if 'has no effect' in para_text.lower() or 'this diagnostic flag exists for gcc compatibility' in para_text.lower():
-                    self.flags[self.current_flag]['has_no_effect'] = True
-
-    def handle_data(self, data):
-        if self.in_heading or self.in_paragraph:
-            self.text_buffer += data
+
+    def feed(self, html_content):
+        """Scan the document with a single compiled-regex pass.
+
+        Matching h2/h3/h4 and p blocks directly replaces the per-tag
+        html.parser callbacks (hundreds of thousands of Python-level events
+        on the full reference page) with O(blocks) native regex matches.
+        """
+        for match in _BLOCK_RE.finditer(html_content):
+            heading_body = match.group(2)
+            if heading_body is not None:
+                self.record_heading(_block_text(heading_body))
+            else:
+                self.record_paragraph(_block_text(match.group(3)))
+
+    def record_heading(self, heading_text):
+        """Process the text of one heading, starting a new flag section."""
+        heading_text = heading_text.strip()
+
+        # Extract flag name from heading (format: "-Wflag-name¶")
+        # Include = for flags like -Wformat=2
+        match = _FLAG_RE.match(heading_text)
+        if match:
+            # Interned: each name recurs across implies/implied_by/closure
+            # lists, so share one string object and get pointer-fast hashing
+            flag_name = sys.intern(match.group(1))
+            self.current_flag = flag_name
+            self.flags[flag_name]  # create the entry on first sight
+
+    def record_paragraph(self, para_text):
+        """Process the text of one paragraph under the current flag."""
+        para_text = para_text.strip()
+
+        if self.current_flag and para_text:
+            para_text_lower = para_text.lower()
+
+            # Check for "Controls" or "Also controls" pattern
+            # The HTML uses anchor tags for flags, so the text looks like:
+            # "Controls -Wflag1, -Wflag2, -Wflag3."
+            # or "Also controls -Wflag1, -Wflag2."
+            controls_match = _CONTROLS_RE.search(para_text)
+            if controls_match:
+                controlled_flags_str = controls_match.group(1)
+                controlled_flags = _FLAG_FINDALL_RE.findall(controlled_flags_str)
+                self.flags[self.current_flag]['implies'].update(
+                    sys.intern(controlled) for controlled in controlled_flags)
+
+            # Check for "Synonym for" pattern
+            synonym_match = _SYNONYM_RE.search(para_text)
+            if synonym_match:
+                synonym_flag = sys.intern(synonym_match.group(1))
+                # Store this flag as a synonym of the canonical flag
+                self.synonyms[self.current_flag] = synonym_flag
+                # Also add to implies for the graph representation
+                self.flags[self.current_flag]['implies'].add(synonym_flag)
+
+            # Check if it's an error by default
+            if 'error by default' in para_text_lower:
+                self.flags[self.current_flag]['is_error'] = True
+
+            # Check if enabled by default - must be the flag itself, not just sub-flags
+            # "This diagnostic is enabled by default" = the flag is on by default
+            # "Some of the diagnostics controlled by this flag are enabled by default" = only sub-flags
+            if 'This diagnostic is enabled by default' in para_text:
+                self.flags[self.current_flag]['is_default'] = True
+            elif 'Some of the diagnostics controlled by this flag are enabled by default' in para_text:
+                self.flags[self.current_flag]['is_default'] = False
+                self.flags[self.current_flag]['some_default'] = True
+
+            # Check if the flag has no effect (should be treated as enabled for consistency)
+            if 'has no effect' in para_text_lower or 'this diagnostic flag exists for gcc compatibility' in para_text_lower:
+                self.flags[self.current_flag]['has_no_effect'] = True
 
     def resolve_synonym(self, flag_name):
         """Resolve a flag to its canonical form by following synonym chain."""
@@ -141,20 +170,7 @@ class DiagnosticsParser(HTMLParser):
         for flag_name in list(self.flags.keys()):
             if flag_name in self.synonyms:
                 canonical = self.resolve_synonym(flag_name)
-                
-                # Ensure canonical flag exists
-                if canonical not in self.flags:
-                    self.flags[canonical] = {
-                        'implies': [],
-                        'implied_by': [],
-                        'description': '',
-                        'is_error': False,
-                        'is_default': False,
-                        'some_default': False,
-                        'synonym_for': None,
-                        'has_no_effect': False
-                    }
-                
+
                 # Copy properties from canonical to synonym
                 # But keep the implies relationship (pointing to canonical)
                 # and add a synonym_for field
@@ -163,59 +179,267 @@ class DiagnosticsParser(HTMLParser):
                 self.flags[flag_name]['is_default'] = self.flags[canonical]['is_default']
                 self.flags[flag_name]['some_default'] = self.flags[canonical]['some_default']
     
-    def build_implied_by(self):
-        """Build reverse relationships (implied_by from implies)."""
-        for flag_name, flag_data in self.flags.items():
+    def finalize_relationships(self):
+        """Build implied_by from implies and freeze both to sorted lists.
+
+        One walk over the edges both accumulates the reverse relation and
+        finalizes 'implies'; only 'implied_by' needs the short second sweep,
+        since reverse edges keep arriving until the walk is done. The sets
+        make parsing O(1) per insertion; the JSON output keeps the stable
+        list form.
+        """
+        # list(): referenced flags that weren't parsed directly get created
+        # (by the defaultdict) while we iterate
+        for flag_name, flag_data in list(self.flags.items()):
             for implied_flag in flag_data['implies']:
-                if implied_flag in self.flags:
-                    if flag_name not in self.flags[implied_flag]['implied_by']:
-                        self.flags[implied_flag]['implied_by'].append(flag_name)
-                else:
-                    # Create entry for referenced flag that wasn't parsed directly
-                    self.flags[implied_flag] = {
-                        'implies': [],
-                        'implied_by': [flag_name],
-                        'description': '',
-                        'is_error': False,
-                        'is_default': False,
-                        'some_default': False,
-                        'synonym_for': None,
-                        'has_no_effect': False
-                    }
-
-
-def fetch_documentation(url):
-    """Fetch the diagnostics documentation HTML."""
+                self.flags[implied_flag]['implied_by'].add(flag_name)
+            flag_data['implies'] = sorted(flag_data['implies'])
+
+        for flag_data in self.flags.values():
+            if isinstance(flag_data['implies'], set):
+                # Created during the walk above; has no forward edges
+                flag_data['implies'] = []
+            flag_data['implied_by'] = sorted(flag_data['implied_by'])
+
+
+def parse_documentation(html_content):
+    """Parse the diagnostics HTML into a populated DiagnosticsParser.
+
+    Uses lxml's C parser when it is installed; otherwise falls back to the
+    dependency-free single-pass regex scan in DiagnosticsParser.feed.
+    """
+    parser = DiagnosticsParser()
+
+    if lxml_html is None:
+        parser.feed(html_content)
+        return parser
+
+    tree = lxml_html.fromstring(html_content)
+    for heading in tree.iter('h2', 'h3', 'h4'):
+        parser.record_heading(heading.text_content())
+        # Paragraphs up to the next heading belong to this flag
+        for sibling in heading.itersiblings():
+            if sibling.tag in ('h2', 'h3', 'h4'):
+                break
+            if sibling.tag == 'p':
+                parser.record_paragraph(sibling.text_content())
+    return parser
+
+
+def fetch_documentation(url, cache_path=None):
+    """Fetch the diagnostics documentation HTML.
+
+    When cache_path is given, the page is streamed to disk together with its
+    ETag/Last-Modified validators and revalidated with a conditional GET on
+    the next run; a 304 Not Modified answer reuses the cached copy instead of
+    re-downloading the ~MB page.
+    """
     print(f"Fetching documentation from {url}...", file=sys.stderr)
+
+    meta_path = cache_path + '.meta' if cache_path else None
+    headers = {'Accept-Encoding': 'gzip'}
+    if cache_path and os.path.exists(cache_path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
     try:
-        # Create SSL context that doesn't verify certificates (for macOS compatibility)
         ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        with urlopen(url, timeout=30, context=ssl_context) as response:
-            return response.read().decode('utf-8')
+        request = Request(url, headers=headers)
+        with urlopen(request, timeout=30, context=ssl_context) as response:
+            # Transfer is gzip-compressed when the server supports it
+            decompressor = None
+            if response.headers.get('Content-Encoding') == 'gzip':
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+            if cache_path is None:
+                data = response.read()
+                if decompressor:
+                    data = decompressor.decompress(data) + decompressor.flush()
+                return data.decode('utf-8')
+
+            # Stream to disk so the cache is usable even across partial reads
+            with open(cache_path, 'wb') as f:
+                while True:
+                    chunk = response.read(65536)
+                    if not chunk:
+                        break
+                    if decompressor:
+                        chunk = decompressor.decompress(chunk)
+                    f.write(chunk)
+                if decompressor:
+                    f.write(decompressor.flush())
+            with open(meta_path, 'w') as f:
+                json.dump({
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }, f)
+    except HTTPError as e:
+        if e.code == 304 and cache_path:
+            print("Documentation not modified; using cached copy", file=sys.stderr)
+        else:
+            print(f"Error fetching documentation: {e}", file=sys.stderr)
+            sys.exit(1)
     except URLError as e:
         print(f"Error fetching documentation: {e}", file=sys.stderr)
         sys.exit(1)
 
+    with open(cache_path, encoding='utf-8') as f:
+        return f.read()
+
+
+def _tarjan_scc(children):
+    """Find strongly connected components of an integer-indexed graph.
+
+    Iterative Tarjan; returns (components, component_of) where components
+    is a list of node lists emitted in reverse topological order of the
+    condensation (every component appears after the components it can reach).
+    """
+    n = len(children)
+    index = [None] * n
+    lowlink = [0] * n
+    on_stack = [False] * n
+    stack = []
+    components = []
+    component_of = [0] * n
+    counter = 0
+
+    for root in range(n):
+        if index[root] is not None:
+            continue
+        # Explicit DFS stack of (node, child position) to avoid recursion limits
+        work = [(root, 0)]
+        while work:
+            node, child_pos = work.pop()
+            if child_pos == 0:
+                index[node] = lowlink[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack[node] = True
+            recurse = False
+            for i in range(child_pos, len(children[node])):
+                child = children[node][i]
+                if index[child] is None:
+                    work.append((node, i + 1))
+                    work.append((child, 0))
+                    recurse = True
+                    break
+                elif on_stack[child]:
+                    lowlink[node] = min(lowlink[node], index[child])
+            if recurse:
+                continue
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component_of[member] = len(components)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+    return components, component_of
+
+
+def _iter_bits(bits):
+    """Yield the indices of the set bits in an int bitset."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def compute_transitive_closure(flags):
+    """Compute 'implies_transitive' for every flag in one global pass.
+
+    Instead of re-walking the graph per flag with string sets, flags are
+    mapped to integer indices and each closure is kept as an int bitset.
+    Strongly connected components are collapsed first, then components are
+    processed children-first (Tarjan emits them in that order), so each
+    closure is a handful of native bigint ORs.
+    """
+    names = sorted(flags)
+    idx = {name: i for i, name in enumerate(names)}
+    children = [
+        [idx[child] for child in flags[name]['implies'] if child in idx]
+        for name in names
+    ]
+
+    components, component_of = _tarjan_scc(children)
+
+    # Bitset of the members of each component
+    member_bits = [0] * len(components)
+    for comp_id, component in enumerate(components):
+        for node in component:
+            member_bits[comp_id] |= 1 << node
+
+    # Components arrive children-first, so every child closure is ready
+    closure = [0] * len(components)
+    for comp_id, component in enumerate(components):
+        bits = 0
+        for node in component:
+            for child in children[node]:
+                child_comp = component_of[child]
+                if child_comp == comp_id:
+                    # Edge inside a cycle: the whole component implies itself
+                    bits |= member_bits[comp_id]
+                else:
+                    bits |= member_bits[child_comp] | closure[child_comp]
+        closure[comp_id] = bits
+
+    for name in names:
+        bits = closure[component_of[idx[name]]]
+        flags[name]['implies_transitive'] = [names[b] for b in _iter_bits(bits)]
+
+
+# Graph that _all_implies_cached closes over; lru_cache can only key on the
+# flag name, so the flags mapping is installed here by get_all_implies.
+_implies_graph = {}
 
-def get_all_implies(flags, flag_name, visited=None):
-    """Recursively get all flags implied by a given flag."""
-    if visited is None:
-        visited = set()
 
-    if flag_name in visited:
-        return set()
+@functools.lru_cache(maxsize=None)
+def _all_implies_cached(flag_name):
+    """Resolve the closure of one flag with an iterative worklist.
 
-    visited.add(flag_name)
+    No recursion means no frame setup per edge and no recursion-limit risk on
+    deep implication chains; cycles fall out of the visited check naturally.
+    """
     result = set()
+    work = deque()
+    if flag_name in _implies_graph:
+        work.extend(_implies_graph[flag_name]['implies'])
 
-    if flag_name in flags:
-        for implied in flags[flag_name]['implies']:
-            result.add(implied)
-            result.update(get_all_implies(flags, implied, visited))
+    while work:
+        implied = work.popleft()
+        if implied in result:
+            continue
+        result.add(implied)
+        if implied in _implies_graph:
+            work.extend(_implies_graph[implied]['implies'])
 
-    return result
+    return frozenset(result)
+
+
+def get_all_implies(flags, flag_name):
+    """Get all flags implied by a given flag, directly or transitively.
+
+    Results for shared subgraphs are memoized, so querying every flag of one
+    graph does O(V+E) total work rather than re-walking common subtrees.
+    """
+    global _implies_graph
+    if _implies_graph is not flags:
+        # New graph: stale memoized closures must not leak between runs
+        _all_implies_cached.cache_clear()
+        _implies_graph = flags
+
+    return _all_implies_cached(flag_name)
 
 
 def main():
@@ -237,24 +461,27 @@ def main():
         action='store_true',
         help='Include transitive implications in output'
     )
+    parser.add_argument(
+        '--cache',
+        metavar='FILE',
+        default=None,
+        help='Cache the fetched HTML at FILE and revalidate with a conditional GET'
+    )
 
     args = parser.parse_args()
 
     # Fetch and parse
-    html_content = fetch_documentation(args.url)
+    html_content = fetch_documentation(args.url, args.cache)
 
-    diagnostics_parser = DiagnosticsParser()
-    diagnostics_parser.feed(html_content)
+    diagnostics_parser = parse_documentation(html_content)
     diagnostics_parser.resolve_synonyms_in_flags()
-    diagnostics_parser.build_implied_by()
+    diagnostics_parser.finalize_relationships()
 
     flags = diagnostics_parser.flags
 
     # Optionally compute transitive closure
     if args.include_transitive:
-        for flag_name in flags:
-            all_implied = get_all_implies(flags, flag_name)
-            flags[flag_name]['implies_transitive'] = sorted(list(all_implied))
+        compute_transitive_closure(flags)
 
     # Sort flags alphabetically
     sorted_flags = dict(sorted(flags.items()))
@@ -267,9 +494,15 @@ def main():
         'flags': sorted_flags
     }
 
-    # Write output
-    with open(args.output, 'w') as f:
-        json.dump(output, f, indent=2)
+    # Write output; orjson serializes to bytes directly and skips the
+    # pure-Python indenting encoder. Keys are pre-sorted above so both
+    # serializers produce the same layout.
+    if orjson is not None:
+        with open(args.output, 'wb') as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
 
     print(f"Parsed {len(sorted_flags)} diagnostic flags", file=sys.stderr)
     print(f"Found {len(diagnostics_parser.synonyms)} synonyms", file=sys.stderr)
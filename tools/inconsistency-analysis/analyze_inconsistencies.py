@@ -10,18 +10,96 @@ Identifies cases where:
 2. Parent flag has some_default=false but at least one transitive sub-flag has is_default=true
 """
 
+import glob
+import hashlib
 import json
-from typing import Dict, List, Tuple, Set
+import os
+import pickle
+import sys
+from functools import lru_cache
+from typing import Dict, List, Literal, NamedTuple, Optional, Tuple, Set
 import re
 
+try:
+    import orjson
+except ImportError:
+    # Optional speedup only; stdlib json is the fallback
+    orjson = None
+
+# Shared default for flags without an 'implies' list; avoids allocating a
+# fresh empty list per missing key
+_EMPTY: Tuple[str, ...] = ()
+
+# Classification results are cached here, keyed by a digest of the input
+# bytes, so re-runs against an unchanged diagnostics.json skip the whole
+# analysis pipeline
+_CACHE_DIR = 'tools/inconsistency-analysis/.cache'
+
+def _analysis_cache_path(raw_bytes: bytes) -> str:
+    """Cache file for the analysis of this exact diagnostics.json content."""
+    digest = hashlib.blake2b(raw_bytes, digest_size=16).hexdigest()
+    return os.path.join(_CACHE_DIR, digest + '.pkl')
+
+def intern_flag_names(data: Dict) -> Dict:
+    """
+    Intern every flag name in the loaded data.
+
+    The same names recur across implies/implied_by/implies_transitive lists
+    and as dict keys; sharing one string object per name shrinks memory and
+    lets dict/set lookups hit the pointer-equality fast path.
+    """
+    flags = data.get('flags')
+    if not isinstance(flags, dict):
+        return data
+
+    interned = {}
+    for flag_name, flag_data in flags.items():
+        for key in ('implies', 'implied_by', 'implies_transitive'):
+            if key in flag_data:
+                flag_data[key] = [sys.intern(s) for s in flag_data[key]]
+        if flag_data.get('synonym_for'):
+            flag_data['synonym_for'] = sys.intern(flag_data['synonym_for'])
+        interned[sys.intern(flag_name)] = flag_data
+    data['flags'] = interned
+    return data
+
 def load_diagnostics(filepath: str) -> Dict:
-    """Load the diagnostics JSON file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """
+    Load the diagnostics JSON file.
+
+    Parses with orjson when available, and caches the parsed structure in a
+    pickle keyed by the source file's mtime so unchanged inputs skip JSON
+    parsing entirely on repeated runs.
+    """
+    st = os.stat(filepath)
+    cache_path = f'{filepath}.{st.st_mtime_ns}.pkl'
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            # Unpickled strings are not interned, so re-intern here too
+            return intern_flag_names(pickle.load(f))
+
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    data = intern_flag_names(orjson.loads(raw) if orjson is not None else json.loads(raw))
+
+    # Drop caches left over from older versions of the file
+    for stale in glob.glob(glob.escape(filepath) + '.*.pkl'):
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+    with open(cache_path, 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
 
+    return data
+
+@lru_cache(maxsize=None)
 def flag_to_url(flag_name: str) -> str:
     """
     Convert a flag name to its documentation URL.
+
+    Cached: the same names recur across issues (parents reappear as other
+    parents' sub-flags), so each unique name is transformed once.
     
     Args:
         flag_name: The flag name (e.g., "-Wdynamic-exception-spec" or "-Wc++14-compat")
@@ -40,16 +118,160 @@ def flag_to_url(flag_name: str) -> str:
     
     return f"{base_url}#{fragment}"
 
+@lru_cache(maxsize=None)
 def flag_link(flag_name: str) -> str:
     """Create a markdown link for a flag."""
     return f"[`{flag_name}`]({flag_to_url(flag_name)})"
 
+class SubflagStatus(NamedTuple):
+    """Reporting view of one sub-flag; is_default is None when the flag is missing from the data."""
+    name: str
+    is_default: Optional[bool]
+    is_error: bool = False
+    has_no_effect: bool = False
+    is_type0: bool = False
+    some_default: Optional[bool] = False
+    missing: bool = False
+
+class Issue(NamedTuple):
+    """
+    One recorded inconsistency.
+
+    A single compact record covers all four issue types; fields that a type
+    doesn't use keep their defaults. Tuples avoid the thousands of small
+    dicts the checker used to allocate per issue.
+    """
+    flag: str
+    parent_some_default: bool
+    parent_is_default: bool
+    parent_is_error: bool = False
+    direct_subflags: Tuple[SubflagStatus, ...] = ()
+    direct_names: frozenset = frozenset()
+    transitive_count: int = 0
+    enabled_by_default: Tuple[SubflagStatus, ...] = ()
+    enabled_by_default_count: int = 0
+    truly_enabled_count: int = 0
+    not_enabled_by_default: Tuple[SubflagStatus, ...] = ()
+    not_enabled_by_default_count: int = 0
+    has_implies: bool = False
+    has_implies_transitive: bool = False
+
+def build_subflag_details(subflag_names: List[str], encoding: 'FlagEncoding') -> Tuple[SubflagStatus, ...]:
+    """
+    Build per-sub-flag status records for reporting.
+
+    Only called for flags that actually get recorded as issues, so the common
+    "no issue" path allocates nothing.
+    """
+    details = []
+    for subflag_name in subflag_names:
+        i = encoding.index.get(subflag_name)
+        if i is not None:
+            details.append(SubflagStatus(
+                name=subflag_name,
+                is_default=encoding.enabled[i],
+                is_error=encoding.is_error[i],
+                has_no_effect=encoding.has_no_effect[i],
+                is_type0=encoding.type0[i],
+                some_default=encoding.some_default[i]
+            ))
+        else:
+            # Sub-flag not found in the data
+            details.append(SubflagStatus(
+                name=subflag_name,
+                is_default=None,
+                some_default=None,
+                missing=True
+            ))
+    return tuple(details)
+
+class FlagEncoding:
+    """
+    Integer-indexed view of the flags table.
+
+    Each flag gets an index; the per-flag attributes become flat boolean
+    lists and the transitive relation becomes frozensets of indices, so the
+    inconsistency kernel below runs on C-level set algebra instead of
+    per-flag dict lookups and string hashing. Flag indices follow the
+    sorted JSON order, so sorted index sets reproduce the parser's sorted
+    name lists.
+    """
+
+    def __init__(self, flags: Dict):
+        self.names = list(flags)
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+        n = len(self.names)
+        self.is_default = [False] * n
+        self.is_error = [False] * n
+        self.has_no_effect = [False] * n
+        self.some_default = [False] * n
+        self.type0 = [False] * n
+        self.enabled = [False] * n
+        self.truly_enabled = [False] * n
+        self.implies = [None] * n           # original name lists, for reporting
+        self.transitive = [None] * n        # index frozensets, missing names dropped
+        self.transitive_count = [0] * n
+
+        needs_closure = []
+        for i, flag_data in enumerate(flags.values()):
+            self.is_default[i] = flag_data.get('is_default', False)
+            self.is_error[i] = flag_data.get('is_error', False)
+            self.has_no_effect[i] = flag_data.get('has_no_effect', False)
+            self.some_default[i] = flag_data.get('some_default', False)
+            self.implies[i] = flag_data.get('implies', _EMPTY)
+            self.type0[i] = self.some_default[i] and not self.implies[i]
+
+            # enabled: treat error by default, has_no_effect, and Type 0 as
+            # enabled. truly_enabled: for Type 2, has_no_effect and Type 0
+            # flags do NOT count, since they can't produce warnings/errors
+            self.enabled[i] = (self.is_default[i] or self.is_error[i]
+                               or self.has_no_effect[i] or self.type0[i])
+            self.truly_enabled[i] = ((self.is_default[i] or self.is_error[i])
+                                     and not self.has_no_effect[i] and not self.type0[i])
+
+            implies_transitive = flag_data.get('implies_transitive')
+            if implies_transitive is None:
+                # Not precomputed by the parser; derive it from implies below
+                needs_closure.append(i)
+            else:
+                self.transitive_count[i] = len(implies_transitive)
+                index = self.index
+                self.transitive[i] = frozenset(
+                    index[s] for s in implies_transitive if s in index)
+
+        # Index sets for the kernel's set algebra
+        self.enabled_set = frozenset(i for i in range(n) if self.enabled[i])
+        self.truly_enabled_set = frozenset(i for i in range(n) if self.truly_enabled[i])
+
+        for i in needs_closure:
+            closure = self._closure_of(i)
+            self.transitive[i] = closure
+            self.transitive_count[i] = len(closure)
+
+    def _closure_of(self, i: int) -> frozenset:
+        """
+        Compute one flag's transitive closure from 'implies' with an
+        iterative worklist. Fallback for data generated without
+        --include-transitive.
+        """
+        index = self.index
+        reached: Set[int] = set()
+        work = list(self.implies[i])
+        while work:
+            j = index.get(work.pop())
+            if j is None or j in reached:
+                continue
+            reached.add(j)
+            work.extend(self.implies[j])
+        return frozenset(reached)
+
 def check_inconsistencies(data: Dict) -> Tuple[List[Dict], List[Dict], List[Dict], List[Dict]]:
     """
     Check for inconsistencies between parent flags and their sub-flags (transitive).
-    
+
     Uses implies_transitive to check the full transitive closure of sub-flags.
-    
+
     Returns:
         Tuple of (type0_issues, type1_issues, type2_issues, type3_issues)
         - type0_issues: Parent has some_default=true but has NO sub-flags at all
@@ -57,465 +279,420 @@ def check_inconsistencies(data: Dict) -> Tuple[List[Dict], List[Dict], List[Dict
         - type2_issues: Parent has some_default=false AND is_default=false but at least one transitive sub-flag has is_default=true
         - type3_issues: Parent has is_default=true but NOT all transitive sub-flags have is_default=true
     """
-    flags = data['flags']
+    enc = FlagEncoding(data['flags'])
+    names = enc.names
+    enabled_set = enc.enabled_set
+    truly_enabled_set = enc.truly_enabled_set
+
     type0_issues = []
     type1_issues = []
     type2_issues = []
     type3_issues = []
-    
-    # First pass: identify Type 0 flags (some_default=true but no children)
-    # We'll treat these as if they have is_default=true for Type 1 analysis
-    type0_flags = set()
-    
-    for flag_name, flag_data in flags.items():
-        implies = flag_data.get('implies', [])
-        parent_some_default = flag_data.get('some_default', False)
-        
-        # Type 0: Parent says some_default=true but has NO sub-flags at all
-        if parent_some_default and not implies:
-            type0_flags.add(flag_name)
-    
-    # Second pass: check for inconsistencies
-    for flag_name, flag_data in flags.items():
-        implies = flag_data.get('implies', [])
-        implies_transitive = flag_data.get('implies_transitive', [])
-        parent_some_default = flag_data.get('some_default', False)
-        
+
+    # The kernel: set algebra over the index sets built by FlagEncoding;
+    # detail records are materialized only for flags that record an issue.
+    # Type 1 and Type 2 are split on some_default and Type 2 and Type 3 on
+    # parent_is_default, so each flag reaches at most one of those checks;
+    # only Type 1 and Type 3 can both fire for the same flag.
+    for i in range(len(names)):
+        parent_some_default = enc.some_default[i]
+
         # Record Type 0 issues for reporting
-        if flag_name in type0_flags:
-            type0_issues.append({
-                'flag': flag_name,
-                'parent_some_default': parent_some_default,
-                'parent_is_default': flag_data.get('is_default', False),
-                'has_implies': False,
-                'has_implies_transitive': bool(implies_transitive)
-            })
+        if enc.type0[i]:
+            type0_issues.append(Issue(
+                flag=names[i],
+                parent_some_default=parent_some_default,
+                parent_is_default=enc.is_default[i],
+                has_implies=False,
+                has_implies_transitive=enc.transitive_count[i] > 0
+            ))
             continue
-        
+
         # Only check remaining types for flags that have sub-flags
+        implies = enc.implies[i]
         if not implies:
             continue
-        
-        parent_some_default = flag_data.get('some_default', False)
-        
-        # Check each TRANSITIVE sub-flag's is_default status
-        # Note: is_error, has_no_effect, and Type 0 flags count as enabled by default
-        transitive_subflag_defaults = []
-        for subflag_name in implies_transitive:
-            if subflag_name in flags:
-                subflag_is_default = flags[subflag_name].get('is_default', False)
-                subflag_is_error = flags[subflag_name].get('is_error', False)
-                subflag_has_no_effect = flags[subflag_name].get('has_no_effect', False)
-                subflag_is_type0 = subflag_name in type0_flags
-                # Treat error by default, has_no_effect, and Type 0 as enabled by default
-                is_enabled = subflag_is_default or subflag_is_error or subflag_has_no_effect or subflag_is_type0
-                transitive_subflag_defaults.append({
-                    'name': subflag_name,
-                    'is_default': is_enabled,
-                    'is_error': subflag_is_error,
-                    'has_no_effect': subflag_has_no_effect,
-                    'is_type0': subflag_is_type0
-                })
-            else:
-                # Sub-flag not found in the data
-                transitive_subflag_defaults.append({
-                    'name': subflag_name,
-                    'is_default': None,
-                    'is_error': False,
-                    'has_no_effect': False,
-                    'is_type0': False,
-                    'missing': True
-                })
-        
-        # Also track direct implies for reporting
-        direct_subflag_defaults = []
-        for subflag_name in implies:
-            if subflag_name in flags:
-                subflag_is_default = flags[subflag_name].get('is_default', False)
-                subflag_is_error = flags[subflag_name].get('is_error', False)
-                subflag_has_no_effect = flags[subflag_name].get('has_no_effect', False)
-                subflag_is_type0 = subflag_name in type0_flags
-                # Treat error by default, has_no_effect, and Type 0 as enabled by default
-                is_enabled = subflag_is_default or subflag_is_error or subflag_has_no_effect or subflag_is_type0
-                direct_subflag_defaults.append({
-                    'name': subflag_name,
-                    'is_default': is_enabled,
-                    'is_error': subflag_is_error,
-                    'has_no_effect': subflag_has_no_effect,
-                    'is_type0': subflag_is_type0,
-                    'some_default': flags[subflag_name].get('some_default', False)
-                })
-            else:
-                direct_subflag_defaults.append({
-                    'name': subflag_name,
-                    'is_default': None,
-                    'is_error': False,
-                    'has_no_effect': False,
-                    'is_type0': False,
-                    'some_default': None,
-                    'missing': True
-                })
-        
-        any_transitive_subflag_default = any(sf['is_default'] for sf in transitive_subflag_defaults if sf['is_default'] is not None)
-        all_transitive_subflags_non_default = all(not sf['is_default'] for sf in transitive_subflag_defaults if sf['is_default'] is not None)
-        all_transitive_subflags_default = all(sf['is_default'] for sf in transitive_subflag_defaults if sf['is_default'] is not None)
-        
+
+        transitive = enc.transitive[i]
+        parent_is_error = enc.is_error[i]
         # Treat error by default as enabled by default
-        parent_is_default = flag_data.get('is_default', False) or flag_data.get('is_error', False)
-        parent_is_error = flag_data.get('is_error', False)
-        
-        # Type 1: Parent says some_default=true but no transitive sub-flags are enabled by default
-        if parent_some_default and all_transitive_subflags_non_default:
-            # Find which transitive sub-flags are enabled by default for detailed reporting
-            enabled_by_default = [sf for sf in transitive_subflag_defaults if sf.get('is_default')]
-            
-            type1_issues.append({
-                'flag': flag_name,
-                'parent_some_default': parent_some_default,
-                'parent_is_default': parent_is_default,
-                'parent_is_error': parent_is_error,
-                'direct_subflags': direct_subflag_defaults,
-                'transitive_count': len(implies_transitive),
-                'enabled_by_default_count': len(enabled_by_default)
-            })
-        
-        # Type 2: Parent says some_default=false AND is_default=false but at least one transitive sub-flag is enabled by default
-        # Skip if parent is_default=true (that's Type 3)
-        # For Type 2, we check for ACTUAL enabled flags (excluding has_no_effect)
-        # has_no_effect flags don't produce warnings/errors, so they shouldn't count for Type 2
-        if not parent_some_default and not parent_is_default:
-            # Find truly enabled flags (excluding has_no_effect and Type 0)
-            truly_enabled = [sf for sf in transitive_subflag_defaults 
-                           if sf.get('is_default') and not sf.get('has_no_effect') and not sf.get('is_type0')]
-            
-            if truly_enabled:
-                # Find which transitive sub-flags are enabled by default (for display)
-                enabled_by_default = [sf for sf in transitive_subflag_defaults if sf.get('is_default')]
-                
-                type2_issues.append({
-                    'flag': flag_name,
-                    'parent_some_default': parent_some_default,
-                    'parent_is_default': parent_is_default,
-                    'parent_is_error': parent_is_error,
-                    'direct_subflags': direct_subflag_defaults,
-                    'transitive_count': len(implies_transitive),
-                    'enabled_by_default': enabled_by_default,
-                    'enabled_by_default_count': len(enabled_by_default),
-                    'truly_enabled_count': len(truly_enabled)
-                })
-        
+        parent_is_default = enc.is_default[i] or parent_is_error
+
+        if parent_some_default:
+            # Type 1: Parent says some_default=true but no transitive sub-flags are enabled by default
+            if transitive.isdisjoint(enabled_set):
+                type1_issues.append(Issue(
+                    flag=names[i],
+                    parent_some_default=parent_some_default,
+                    parent_is_default=parent_is_default,
+                    parent_is_error=parent_is_error,
+                    direct_subflags=build_subflag_details(implies, enc),
+                    transitive_count=enc.transitive_count[i],
+                    enabled_by_default_count=0
+                ))
+        elif not parent_is_default:
+            # Type 2: Parent says some_default=false AND is_default=false but at least one transitive sub-flag is enabled by default
+            # For Type 2, we check for ACTUAL enabled flags (excluding has_no_effect)
+            # has_no_effect flags don't produce warnings/errors, so they shouldn't count for Type 2
+            truly = transitive & truly_enabled_set
+            if truly:
+                enabled_by_default = build_subflag_details(
+                    [names[j] for j in sorted(transitive & enabled_set)], enc)
+
+                type2_issues.append(Issue(
+                    flag=names[i],
+                    parent_some_default=parent_some_default,
+                    parent_is_default=parent_is_default,
+                    parent_is_error=parent_is_error,
+                    direct_subflags=build_subflag_details(implies, enc),
+                    direct_names=frozenset(implies),
+                    transitive_count=enc.transitive_count[i],
+                    enabled_by_default=enabled_by_default,
+                    enabled_by_default_count=len(enabled_by_default),
+                    truly_enabled_count=len(truly)
+                ))
+
         # Type 3: Parent is_default=true but NOT all transitive sub-flags have is_default=true
         # If parent is enabled by default, ALL sub-flags should be marked as enabled by default
-        if parent_is_default and not all_transitive_subflags_default:
-            # Find which transitive sub-flags are NOT enabled by default
-            not_enabled_by_default = [sf for sf in transitive_subflag_defaults if not sf.get('is_default') and sf.get('is_default') is not None]
-            
-            type3_issues.append({
-                'flag': flag_name,
-                'parent_some_default': parent_some_default,
-                'parent_is_default': parent_is_default,
-                'parent_is_error': parent_is_error,
-                'direct_subflags': direct_subflag_defaults,
-                'transitive_count': len(implies_transitive),
-                'not_enabled_by_default': not_enabled_by_default,
-                'not_enabled_by_default_count': len(not_enabled_by_default)
-            })
-    
+        # (not exclusive with Type 1: a parent can be enabled AND claim some_default)
+        if parent_is_default and not transitive.issubset(enabled_set):
+            not_enabled_by_default = build_subflag_details(
+                [names[j] for j in sorted(transitive - enabled_set)], enc)
+
+            type3_issues.append(Issue(
+                flag=names[i],
+                parent_some_default=parent_some_default,
+                parent_is_default=parent_is_default,
+                parent_is_error=parent_is_error,
+                direct_subflags=build_subflag_details(implies, enc),
+                direct_names=frozenset(implies),
+                transitive_count=enc.transitive_count[i],
+                not_enabled_by_default=not_enabled_by_default,
+                not_enabled_by_default_count=len(not_enabled_by_default)
+            ))
+
     return type0_issues, type1_issues, type2_issues, type3_issues
 
-def build_flag_hierarchy(issue: Dict, data: Dict, highlight_enabled: bool = False) -> str:
+class LineWriter:
     """
-    Build a visual hierarchy of flags showing parent -> children relationships.
-    
+    Emit report lines straight to a buffered file.
+
+    Lines are newline-separated (not newline-terminated), matching the
+    former '\n'.join of an in-memory list, but the report is never held
+    in memory as a whole.
+    """
+    __slots__ = ('_write', '_started')
+
+    def __init__(self, f):
+        self._write = f.write
+        self._started = False
+
+    def __call__(self, line: str = '') -> None:
+        if self._started:
+            self._write('\n')
+        else:
+            self._started = True
+        self._write(line)
+
+# Section-specific sub-flag decoration: 'plain' for Type 1, 'enabled'
+# highlights enabled-by-default sub-flags (Type 2), 'not_enabled'
+# highlights the sub-flags that are NOT enabled (Type 3)
+HierarchyMode = Literal['plain', 'enabled', 'not_enabled']
+
+def _build_marker_table() -> Dict[tuple, str]:
+    """
+    Enumerate every sub-flag marker string up front.
+
+    The per-sub-flag branch cascade in the hierarchy writer collapses to a
+    single dict lookup keyed by the status booleans plus the section's
+    hierarchy mode.
+    """
+    table = {}
+    for enabled in (False, True):
+        for error in (False, True):
+            for no_effect in (False, True):
+                for type0 in (False, True):
+                    for some_default in (False, True):
+                        for mode in ('plain', 'enabled', 'not_enabled'):
+                            markers = []
+                            if enabled:
+                                if error:
+                                    kind = "enabled by default (error)"
+                                elif no_effect:
+                                    kind = "enabled by default (no effect)"
+                                elif type0:
+                                    kind = "enabled by default (Type 0)"
+                                else:
+                                    kind = "enabled by default"
+                                if mode == 'enabled':
+                                    markers.append(f"✅ **{kind}**")
+                                elif mode == 'not_enabled':
+                                    markers.append(f"✅ {kind}")
+                                else:
+                                    markers.append(kind)
+                            elif mode == 'not_enabled':
+                                markers.append("❌ **NOT enabled by default**")
+                            if some_default:
+                                markers.append("`some_default=true`")
+                            table[(enabled, error, no_effect, type0,
+                                   some_default, mode)] = (
+                                f" — {', '.join(markers)}" if markers else "")
+    return table
+
+_MARKER_TABLE = _build_marker_table()
+
+def write_flag_hierarchy(emit: LineWriter, issue: Issue,
+                         mode: HierarchyMode = 'plain') -> None:
+    """
+    Write a visual hierarchy of flags showing parent -> children relationships.
+
     Args:
-        issue: The issue dictionary containing flag information
-        data: The full diagnostics data
-        highlight_enabled: If True, highlight flags that are enabled by default (for Type 2)
-    
-    Returns:
-        Markdown formatted hierarchy string
+        emit: The report line writer
+        issue: The issue record containing flag information
+        mode: Which sub-flags to highlight; see HierarchyMode
     """
-    flags = data['flags']
-    flag_name = issue['flag']
-    
-    lines = []
-    lines.append(f"**{flag_link(flag_name)}**")
-    lines.append(f"- `some_default`: {issue['parent_some_default']}")
-    parent_is_error = issue.get('parent_is_error', False)
-    if parent_is_error:
-        lines.append(f"- `is_default`: {issue['parent_is_default']} (error by default)")
+    flag_name = issue.flag
+
+    emit(f"**{flag_link(flag_name)}**")
+    emit(f"- `some_default`: {issue.parent_some_default}")
+    parent_is_error = issue.parent_is_error
+    if mode == 'not_enabled':
+        # Type 3: the parent itself being enabled is what the section is about
+        if parent_is_error:
+            emit(f"- `is_default`: {issue.parent_is_default} ← **Parent is error by default (counts as enabled)**")
+        else:
+            emit(f"- `is_default`: {issue.parent_is_default} ← **Parent is enabled by default**")
+    elif parent_is_error:
+        emit(f"- `is_default`: {issue.parent_is_default} (error by default)")
     else:
-        lines.append(f"- `is_default`: {issue['parent_is_default']}")
-    
-    if issue['direct_subflags']:
-        lines.append(f"- **Direct sub-flags** ({len(issue['direct_subflags'])}):")
-        for sf in issue['direct_subflags']:
-            if sf.get('missing'):
-                lines.append(f"  - {flag_link(sf['name'])} ❌ *[MISSING FROM DATA]*")
+        emit(f"- `is_default`: {issue.parent_is_default}")
+
+    if issue.direct_subflags:
+        emit(f"- **Direct sub-flags** ({len(issue.direct_subflags)}):")
+        for sf in issue.direct_subflags:
+            if sf.missing:
+                emit(f"  - {flag_link(sf.name)} ❌ *[MISSING FROM DATA]*")
             else:
-                # Determine if this flag should be highlighted
-                is_enabled = sf.get('is_default', False)
-                is_error = sf.get('is_error', False)
-                has_no_effect = sf.get('has_no_effect', False)
-                is_type0 = sf.get('is_type0', False)
-                has_some_default = sf.get('some_default', False)
-                
-                markers = []
-                if is_enabled and highlight_enabled:
-                    if is_error:
-                        markers.append("✅ **enabled by default (error)**")
-                    elif has_no_effect:
-                        markers.append("✅ **enabled by default (no effect)**")
-                    elif is_type0:
-                        markers.append("✅ **enabled by default (Type 0)**")
-                    else:
-                        markers.append("✅ **enabled by default**")
-                elif is_enabled:
-                    if is_error:
-                        markers.append("enabled by default (error)")
-                    elif has_no_effect:
-                        markers.append("enabled by default (no effect)")
-                    elif is_type0:
-                        markers.append("enabled by default (Type 0)")
-                    else:
-                        markers.append("enabled by default")
-                
-                if has_some_default:
-                    markers.append("`some_default=true`")
-                
-                marker_str = f" — {', '.join(markers)}" if markers else ""
-                lines.append(f"  - {flag_link(sf['name'])}{marker_str}")
-    
-    return "\n".join(lines)
+                marker_str = _MARKER_TABLE[(sf.is_default, sf.is_error,
+                                            sf.has_no_effect, sf.is_type0,
+                                            sf.some_default, mode)]
+                emit(f"  - {flag_link(sf.name)}{marker_str}")
 
-def generate_markdown_report(type0_issues: List[Dict], type1_issues: List[Dict], 
-                            type2_issues: List[Dict], type3_issues: List[Dict], 
-                            data: Dict, output_file: str):
-    """Generate a markdown report of the issues found."""
-    lines = []
-    
+def generate_markdown_report(type0_issues: List[Issue], type1_issues: List[Issue],
+                            type2_issues: List[Issue], type3_issues: List[Issue],
+                            output_file: str):
+    """Generate a markdown report of the issues found, streaming to disk."""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        emit = LineWriter(f)
+        _write_report_body(emit, type0_issues, type1_issues, type2_issues, type3_issues)
+
+    print(f"Report written to: {output_file}")
+
+def _write_report_body(emit: LineWriter, type0_issues: List[Issue], type1_issues: List[Issue],
+                       type2_issues: List[Issue], type3_issues: List[Issue]) -> None:
+    """Emit every line of the markdown report through the writer."""
     # Header
-    lines.append("# Diagnostics.json Inconsistency Analysis Report")
-    lines.append("")
-    lines.append("## Summary")
-    lines.append("")
+    emit("# Diagnostics.json Inconsistency Analysis Report")
+    emit("")
+    emit("## Summary")
+    emit("")
     total_issues = len(type0_issues) + len(type1_issues) + len(type2_issues) + len(type3_issues)
-    lines.append(f"Analysis of `tools/diagnostic-flags/diagnostics.json` using **transitive analysis** "
+    emit(f"Analysis of `tools/diagnostic-flags/diagnostics.json` using **transitive analysis** "
                  f"revealed **{total_issues} total inconsistencies**:")
-    lines.append("")
-    lines.append(f"- **{len(type0_issues)} Type 0 issues**: Parent flag marked as `some_default=true` but has **NO sub-flags at all**")
-    lines.append(f"- **{len(type1_issues)} Type 1 issues**: Parent flag marked as `some_default=true` but NO transitive sub-flags have `is_default=true` (excluding Type 0 flags which are treated as enabled)")
-    lines.append(f"- **{len(type2_issues)} Type 2 issues**: Parent flag marked as `some_default=false` AND `is_default=false` but at least one transitive sub-flag has `is_default=true` (excluding `has_no_effect` flags)")
-    lines.append(f"- **{len(type3_issues)} Type 3 issues**: Parent flag marked as `is_default=true` or `is_error=true` but NOT all transitive sub-flags are enabled (note: `has_no_effect` and Type 0 flags are treated as enabled)")
-    lines.append("")
+    emit("")
+    emit(f"- **{len(type0_issues)} Type 0 issues**: Parent flag marked as `some_default=true` but has **NO sub-flags at all**")
+    emit(f"- **{len(type1_issues)} Type 1 issues**: Parent flag marked as `some_default=true` but NO transitive sub-flags have `is_default=true` (excluding Type 0 flags which are treated as enabled)")
+    emit(f"- **{len(type2_issues)} Type 2 issues**: Parent flag marked as `some_default=false` AND `is_default=false` but at least one transitive sub-flag has `is_default=true` (excluding `has_no_effect` flags)")
+    emit(f"- **{len(type3_issues)} Type 3 issues**: Parent flag marked as `is_default=true` or `is_error=true` but NOT all transitive sub-flags are enabled (note: `has_no_effect` and Type 0 flags are treated as enabled)")
+    emit("")
     
     # Documentation reference
-    lines.append("## Documentation Reference")
-    lines.append("")
-    lines.append("All flag links in this report point to the official [Clang Diagnostics Reference](https://clang.llvm.org/docs/DiagnosticsReference.html).")
-    lines.append("")
+    emit("## Documentation Reference")
+    emit("")
+    emit("All flag links in this report point to the official [Clang Diagnostics Reference](https://clang.llvm.org/docs/DiagnosticsReference.html).")
+    emit("")
     
     # Methodology
-    lines.append("## Methodology")
-    lines.append("")
-    lines.append("This analysis uses the `implies_transitive` field in the JSON, which contains the full transitive closure of all sub-flags.")
-    lines.append("")
+    emit("## Methodology")
+    emit("")
+    emit("This analysis uses the `implies_transitive` field in the JSON, which contains the full transitive closure of all sub-flags.")
+    emit("")
     
     # Type 0 Issues
     if type0_issues:
-        lines.append("---")
-        lines.append("")
-        lines.append("## Type 0 Issues: Claims of Default Sub-flags with NO Sub-flags")
-        lines.append("")
-        lines.append(f"**Count: {len(type0_issues)}**")
-        lines.append("")
-        lines.append("These flags claim to have some sub-flags enabled by default (`some_default=true`), "
+        emit("---")
+        emit("")
+        emit("## Type 0 Issues: Claims of Default Sub-flags with NO Sub-flags")
+        emit("")
+        emit(f"**Count: {len(type0_issues)}**")
+        emit("")
+        emit("These flags claim to have some sub-flags enabled by default (`some_default=true`), "
                      "but they have **no sub-flags at all** (empty `implies` list).")
-        lines.append("")
+        emit("")
         
         for i, issue in enumerate(type0_issues, 1):
-            lines.append(f"### {i}. {flag_link(issue['flag'])}")
-            lines.append("")
-            lines.append(f"- `some_default`: {issue['parent_some_default']}")
-            lines.append(f"- `is_default`: {issue['parent_is_default']}")
-            lines.append(f"- `implies`: *(empty)*")
-            lines.append("")
+            emit(f"### {i}. {flag_link(issue.flag)}")
+            emit("")
+            emit(f"- `some_default`: {issue.parent_some_default}")
+            emit(f"- `is_default`: {issue.parent_is_default}")
+            emit(f"- `implies`: *(empty)*")
+            emit("")
     
     # Type 1 Issues
     if type1_issues:
-        lines.append("---")
-        lines.append("")
-        lines.append("## Type 1 Issues: False Claims of Default Sub-flags")
-        lines.append("")
-        lines.append(f"**Count: {len(type1_issues)}**")
-        lines.append("")
-        lines.append("These flags claim to have some sub-flags enabled by default (`some_default=true`), "
+        emit("---")
+        emit("")
+        emit("## Type 1 Issues: False Claims of Default Sub-flags")
+        emit("")
+        emit(f"**Count: {len(type1_issues)}**")
+        emit("")
+        emit("These flags claim to have some sub-flags enabled by default (`some_default=true`), "
                      "but when checking the full transitive closure, **none** of their transitive sub-flags "
                      "are actually enabled by default. Note: Type 0 flags (flags with `some_default=true` but no children) "
                      "are treated as enabled by default, so they don't cause Type 1 issues.")
-        lines.append("")
+        emit("")
         
         for i, issue in enumerate(type1_issues, 1):
-            lines.append(f"### {i}. {flag_link(issue['flag'])}")
-            lines.append("")
-            lines.append(f"**Transitive sub-flags count**: {issue['transitive_count']} (0 enabled by default)")
-            lines.append("")
-            lines.append("#### Flag Hierarchy")
-            lines.append("")
-            lines.append(build_flag_hierarchy(issue, data, highlight_enabled=False))
-            lines.append("")
+            emit(f"### {i}. {flag_link(issue.flag)}")
+            emit("")
+            emit(f"**Transitive sub-flags count**: {issue.transitive_count} (0 enabled by default)")
+            emit("")
+            emit("#### Flag Hierarchy")
+            emit("")
+            write_flag_hierarchy(emit, issue, mode='plain')
+            emit("")
     
     # Type 2 Issues
     if type2_issues:
-        lines.append("---")
-        lines.append("")
-        lines.append("## Type 2 Issues: Missing Claims of Default Sub-flags")
-        lines.append("")
-        lines.append(f"**Count: {len(type2_issues)}**")
-        lines.append("")
-        lines.append("These flags have BOTH `some_default=false` AND `is_default=false`, "
+        emit("---")
+        emit("")
+        emit("## Type 2 Issues: Missing Claims of Default Sub-flags")
+        emit("")
+        emit(f"**Count: {len(type2_issues)}**")
+        emit("")
+        emit("These flags have BOTH `some_default=false` AND `is_default=false`, "
                      "but when checking the full transitive closure, at least one of their transitive "
                      "sub-flags IS actually enabled by default. "
                      "Note: For Type 2 analysis, `has_no_effect` flags are NOT counted as enabled, since they "
                      "don't produce warnings/errors and thus don't affect correctness. "
                      "Flags that are enabled by default are marked with ✅.")
-        lines.append("")
+        emit("")
         
         for i, issue in enumerate(type2_issues, 1):
-            lines.append(f"### {i}. {flag_link(issue['flag'])}")
-            lines.append("")
-            lines.append(f"**Transitive sub-flags count**: {issue['transitive_count']} "
-                        f"({issue['enabled_by_default_count']} enabled by default)")
-            lines.append("")
-            lines.append("#### Flag Hierarchy")
-            lines.append("")
-            lines.append(build_flag_hierarchy(issue, data, highlight_enabled=True))
-            lines.append("")
+            emit(f"### {i}. {flag_link(issue.flag)}")
+            emit("")
+            emit(f"**Transitive sub-flags count**: {issue.transitive_count} "
+                        f"({issue.enabled_by_default_count} enabled by default)")
+            emit("")
+            emit("#### Flag Hierarchy")
+            emit("")
+            write_flag_hierarchy(emit, issue, mode='enabled')
+            emit("")
             
             # Show examples of enabled flags if they're not direct children
-            if issue['enabled_by_default']:
-                # Get names of direct children
-                direct_names = {sf['name'] for sf in issue['direct_subflags']}
+            if issue.enabled_by_default:
                 # Find enabled flags that are not direct children
-                indirect_enabled = [sf for sf in issue['enabled_by_default'] 
-                                   if sf['name'] not in direct_names and not sf.get('missing')]
+                direct_names = issue.direct_names
+                indirect_enabled = [sf for sf in issue.enabled_by_default
+                                   if sf.name not in direct_names and not sf.missing]
                 
                 if indirect_enabled:
-                    lines.append(f"**Transitive (indirect) sub-flags enabled by default** "
+                    emit(f"**Transitive (indirect) sub-flags enabled by default** "
                                f"(showing up to 10 of {len(indirect_enabled)}):")
-                    lines.append("")
+                    emit("")
                     for sf in indirect_enabled[:10]:
-                        lines.append(f"- {flag_link(sf['name'])}")
-                    lines.append("")
+                        emit(f"- {flag_link(sf.name)}")
+                    emit("")
     
     # Type 3 Issues
     if type3_issues:
-        lines.append("---")
-        lines.append("")
-        lines.append("## Type 3 Issues: Parent Enabled by Default but Not All Sub-flags")
-        lines.append("")
-        lines.append(f"**Count: {len(type3_issues)}**")
-        lines.append("")
-        lines.append("These flags have `is_default=true` (or `is_error=true`, which counts as enabled), "
+        emit("---")
+        emit("")
+        emit("## Type 3 Issues: Parent Enabled by Default but Not All Sub-flags")
+        emit("")
+        emit(f"**Count: {len(type3_issues)}**")
+        emit("")
+        emit("These flags have `is_default=true` (or `is_error=true`, which counts as enabled), "
                      "which means they are enabled by default. "
                      "This logically implies that ALL of their sub-flags should also be marked as "
                      "`is_default=true`, `is_error=true`, `has_no_effect=true`, or be Type 0 flags, but some sub-flags are NOT marked as enabled by default. "
                      "Flags that are NOT enabled by default are marked with ❌. "
                      "Note: Flags with no effect and Type 0 flags are treated as enabled since they don't affect program behavior or imply enablement.")
-        lines.append("")
+        emit("")
         
         for i, issue in enumerate(type3_issues, 1):
-            lines.append(f"### {i}. {flag_link(issue['flag'])}")
-            lines.append("")
-            lines.append(f"**Transitive sub-flags count**: {issue['transitive_count']} "
-                        f"({issue['not_enabled_by_default_count']} NOT enabled by default)")
-            lines.append("")
-            lines.append("#### Flag Hierarchy")
-            lines.append("")
-            
-            # Build hierarchy with inverted highlighting (highlight NOT enabled)
-            flag_name = issue['flag']
-            lines.append(f"**{flag_link(flag_name)}**")
-            lines.append(f"- `some_default`: {issue['parent_some_default']}")
-            parent_is_error = issue.get('parent_is_error', False)
-            if parent_is_error:
-                lines.append(f"- `is_default`: {issue['parent_is_default']} ← **Parent is error by default (counts as enabled)**")
-            else:
-                lines.append(f"- `is_default`: {issue['parent_is_default']} ← **Parent is enabled by default**")
-            
-            if issue['direct_subflags']:
-                lines.append(f"- **Direct sub-flags** ({len(issue['direct_subflags'])}):")
-                for sf in issue['direct_subflags']:
-                    if sf.get('missing'):
-                        lines.append(f"  - {flag_link(sf['name'])} ❌ *[MISSING FROM DATA]*")
-                    else:
-                        is_enabled = sf.get('is_default', False)
-                        is_error = sf.get('is_error', False)
-                        has_no_effect = sf.get('has_no_effect', False)
-                        is_type0 = sf.get('is_type0', False)
-                        has_some_default = sf.get('some_default', False)
-                        
-                        markers = []
-                        if not is_enabled:
-                            markers.append("❌ **NOT enabled by default**")
-                        elif is_enabled:
-                            if is_error:
-                                markers.append("✅ enabled by default (error)")
-                            elif has_no_effect:
-                                markers.append("✅ enabled by default (no effect)")
-                            elif is_type0:
-                                markers.append("✅ enabled by default (Type 0)")
-                            else:
-                                markers.append("✅ enabled by default")
-                        
-                        if has_some_default:
-                            markers.append("`some_default=true`")
-                        
-                        marker_str = f" — {', '.join(markers)}" if markers else ""
-                        lines.append(f"  - {flag_link(sf['name'])}{marker_str}")
-            lines.append("")
+            emit(f"### {i}. {flag_link(issue.flag)}")
+            emit("")
+            emit(f"**Transitive sub-flags count**: {issue.transitive_count} "
+                        f"({issue.not_enabled_by_default_count} NOT enabled by default)")
+            emit("")
+            emit("#### Flag Hierarchy")
+            emit("")
+            write_flag_hierarchy(emit, issue, mode='not_enabled')
+            emit("")
             
             # Show examples of NOT enabled flags if they're not direct children
-            if issue['not_enabled_by_default']:
-                # Get names of direct children
-                direct_names = {sf['name'] for sf in issue['direct_subflags']}
+            if issue.not_enabled_by_default:
                 # Find NOT enabled flags that are not direct children
-                indirect_not_enabled = [sf for sf in issue['not_enabled_by_default'] 
-                                       if sf['name'] not in direct_names and not sf.get('missing')]
+                direct_names = issue.direct_names
+                indirect_not_enabled = [sf for sf in issue.not_enabled_by_default
+                                       if sf.name not in direct_names and not sf.missing]
                 
                 if indirect_not_enabled:
-                    lines.append(f"**Transitive (indirect) sub-flags NOT enabled by default** "
+                    emit(f"**Transitive (indirect) sub-flags NOT enabled by default** "
                                f"(showing up to 10 of {len(indirect_not_enabled)}):")
-                    lines.append("")
+                    emit("")
                     for sf in indirect_not_enabled[:10]:
-                        lines.append(f"- {flag_link(sf['name'])}")
-                    lines.append("")
+                        emit(f"- {flag_link(sf.name)}")
+                    emit("")
     
     if not type0_issues and not type1_issues and not type2_issues and not type3_issues:
-        lines.append("## Result")
-        lines.append("")
-        lines.append("✅ No inconsistencies found!")
-        lines.append("")
-    
-    # Write to file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
-    
-    print(f"Report written to: {output_file}")
+        emit("## Result")
+        emit("")
+        emit("✅ No inconsistencies found!")
+        emit("")
 
 def main():
     filepath = 'tools/diagnostic-flags/diagnostics.json'
     output_file = 'tools/inconsistency-analysis/inconsistency_report.md'
     
     print("Loading diagnostics.json...")
-    data = load_diagnostics(filepath)
-    print(f"Loaded {data.get('flag_count', 'unknown')} flags")
-    print()
-    
-    print("Analyzing for inconsistencies...")
-    type0_issues, type1_issues, type2_issues, type3_issues = check_inconsistencies(data)
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+
+    cache_path = _analysis_cache_path(raw)
+    if os.path.exists(cache_path):
+        # Unchanged input: reuse the classification from a previous run
+        with open(cache_path, 'rb') as f:
+            (flag_count, type0_issues, type1_issues,
+             type2_issues, type3_issues) = pickle.load(f)
+        print(f"Loaded {flag_count} flags")
+        print()
+        print("Analyzing for inconsistencies... (reusing cached analysis)")
+    else:
+        data = load_diagnostics(filepath)
+        flag_count = data.get('flag_count', 'unknown')
+        print(f"Loaded {flag_count} flags")
+        print()
+
+        print("Analyzing for inconsistencies...")
+        type0_issues, type1_issues, type2_issues, type3_issues = check_inconsistencies(data)
+
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        # Drop caches for older versions of the input
+        for stale in glob.glob(os.path.join(glob.escape(_CACHE_DIR), '*.pkl')):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((flag_count, type0_issues, type1_issues,
+                         type2_issues, type3_issues),
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
     print()
-    
+
     print(f"Found {len(type0_issues)} Type 0 issues")
     print(f"Found {len(type1_issues)} Type 1 issues")
     print(f"Found {len(type2_issues)} Type 2 issues")
@@ -523,7 +700,7 @@ def main():
     print()
     
     print("Generating markdown report...")
-    generate_markdown_report(type0_issues, type1_issues, type2_issues, type3_issues, data, output_file)
+    generate_markdown_report(type0_issues, type1_issues, type2_issues, type3_issues, output_file)
 
 if __name__ == '__main__':
     main()